@@ -1,23 +1,46 @@
-from flask import Flask, jsonify, request, render_template_string, abort, redirect, url_for, session
+from flask import Flask, Response, request, abort, redirect, url_for, session
 from werkzeug.middleware.proxy_fix import ProxyFix
-import yaml, os, time, re
-from collections import defaultdict
+import yaml, orjson, os, time, hashlib, hmac, threading, functools, gzip, unicodedata
+from array import array
+from bisect import bisect_left, insort
+from collections import deque, OrderedDict
 
 app = Flask(__name__)
 
 # Trust OpenShift router proxy headers
 app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)
 app.config['PREFERRED_URL_SCHEME'] = 'https'
+# /static assets are referenced with a ?v=<content hash>, so they can be cached for a year
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 31536000
 
 # === In-memory state (pod-local). ===
-PLAYERS = set()                 # canonical display names
-NAME_INDEX = {}                 # lowercased -> canonical
-SCORES = defaultdict(int)       # canonical -> score (cumulative)
-SUBMITTED = set()               # canonical submitted at least once for current question
+# Run exactly one process (one replica, one gunicorn worker; see gunicorn.conf.py):
+# a second worker would keep its own diverging copy of everything below.
+# Every read-modify-write of the globals below happens under STATE_LOCK so the app
+# is safe under a concurrent server (gevent greenlets or threads). Re-entrant because
+# mutators call each other (submit -> _advance_to_answer).
+STATE_LOCK = threading.RLock()
+# Notified (under STATE_LOCK) whenever STATE_VERSION moves; wakes /api/events streams
+STATE_COND = threading.Condition(STATE_LOCK)
+
+NAME_INDEX = {}                 # name_key() -> canonical; the registered-player set
+SCORES = {}                     # canonical -> score (cumulative); keys are exactly the players
+SCORE_ORDER = []                # sorted [(-score, canonical)]; kept in step with SCORES
+SCORES_VERSION = 0              # bumped on every SCORES change
+PLAYER_ID = {}                  # canonical -> dense int id, assigned once at registration
+PLAYER_NAMES = []               # id -> canonical
+SUBMITTED = bytearray()         # id -> 1 if submitted at least once for current question
+SUBMITTED_COUNT = 0             # number of 1s in SUBMITTED
 CURRENT_ANSWERS = {}            # canonical -> last selected option index (or None) for current question
-LAST_SUBMISSION_TS = {}         # canonical -> float
+LAST_SUBMISSION_TS = OrderedDict()  # canonical -> deque of monotonic_ns() of recent accepted submits (LRU-bounded)
+THROTTLE_MAX = 2048
+SUBMIT_THROTTLE_NS = 300_000_000    # min gap between accepted submits per player
+SUBMIT_BURST = 4                    # ...and at most this many accepted submits
+SUBMIT_WINDOW_NS = 2_000_000_000    # ...per sliding window of this length
 PHASE = "lobby"                 # lobby | question | answer | reveal | final
 CURRENT_INDEX = -1              # -1 in lobby; 0..N-1 during quiz
+# Suggested poll interval per phase for clients without EventSource
+POLL_MS = {"lobby": 5000, "question": 1000, "answer": 2000, "reveal": 2000, "final": 10000}
 
 # Score-once guard
 LAST_SCORED_INDEX = -1
@@ -26,54 +49,222 @@ LAST_SCORED_INDEX = -1
 LB_ROWS_SNAPSHOT = []           # [{"name":..., "score":...}, ...]
 LB_WINNERS_SNAPSHOT = []        # [names]
 LB_MAX_SNAPSHOT = 0
+# (encoded snapshot, its gzip or None); one tuple so lock-free readers never mix two snapshots
+LB_ENCODED_SNAPSHOT = (orjson.dumps({"rows": [], "winners": [], "max_score": 0}), None)
+LB_SNAPSHOT_VERSION = -1        # SCORES_VERSION the snapshot was taken at
+GZIP_MIN_SIZE = 500
+
+# Serialized /api/state, rebuilt only after STATE_VERSION moves
+STATE_VERSION = 0
+_STATE_CACHE = (-1, b"", "", -1, b"")  # (version, body, etag, base_id, counts body)
+# Counters that change on their own (register/submit); everything else is the "base".
+# base_id moves only when the base does, so SSE can send just the counters otherwise.
+COUNT_FIELDS = ("players_count", "submissions_count")
+SSE_MIN_INTERVAL_S = 0.05  # per stream: changes closer together than this share one frame
+_STATE_BASE = (None, -1)                # (payload minus COUNT_FIELDS, base_id)
 
 # Quiz session id (changes on Start/Reset) to prevent client auto-select carryover
 QUIZ_SESSION = str(int(time.time()))
 
 # Admin auth (session-based)
 ADMIN_PASSWORD = os.environ.get("ADMIN_PASSWORD", "")
+ADMIN_PASSWORD_B = ADMIN_PASSWORD.encode()  # for the constant-time compare at login
 app.secret_key = os.environ.get("SECRET_KEY", os.urandom(24))
 
 # ----------------------- helpers -----------------------
 
+# libyaml-backed loader when PyYAML was built with it; same semantics as safe_load
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+if YAML_LOADER is yaml.SafeLoader:
+    app.logger.warning("PyYAML built without libyaml; using the pure-Python loader")
+
+# Parsed questions keyed by (path, mtime_ns, size); treat the cached list as read-only
+_Q_CACHE = None
+
 def load_questions():
+    global _Q_CACHE
     path = os.environ.get("QUESTIONS_FILE", "/app/questions.yaml")
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size)
+    if _Q_CACHE is not None and _Q_CACHE[0] == key:
+        return _Q_CACHE[1]
     with open(path, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f) or {}
-    return data.get("questions", [])
-
-def current_question():
+        data = yaml.load(f, Loader=YAML_LOADER) or {}
+    qs = data.get("questions", [])
+    _Q_CACHE = (key, qs)
+    return qs
+
+def public_questions(qs):
+    """Answer-stripped views of the questions, in the same order."""
+    return [{"text": q.get("text"), "options": q.get("options", []), "note": q.get("note")} for q in qs]
+
+def answer_index(q):
+    """Correct option index as an int, or -1 when missing or not a valid option."""
+    try:
+        a = int(q.get("answer"))
+    except (TypeError, ValueError):
+        return -1
+    return a if 0 <= a < len(q.get("options", [])) else -1
+
+# Questions served to requests; refreshed only on Start/Reset or /api/admin/reload.
+# Q_ANSWERS runs parallel to QUESTIONS so grading never touches the question dicts.
+QUESTIONS = load_questions()
+QUESTIONS_PUBLIC = public_questions(QUESTIONS)
+Q_ANSWERS = array("h", map(answer_index, QUESTIONS))
+TOTAL_QUESTIONS = len(QUESTIONS)
+
+def reload_questions():
+    global QUESTIONS, QUESTIONS_PUBLIC, Q_ANSWERS, TOTAL_QUESTIONS
     qs = load_questions()
-    if 0 <= CURRENT_INDEX < len(qs):
-        return qs[CURRENT_INDEX]
-    return None
+    if qs is QUESTIONS:
+        return  # file unchanged: derived views are still valid
+    QUESTIONS = qs
+    QUESTIONS_PUBLIC = public_questions(QUESTIONS)
+    Q_ANSWERS = array("h", map(answer_index, QUESTIONS))
+    TOTAL_QUESTIONS = len(QUESTIONS)
+    mark_state_dirty()
+
+def current_question_public():
+    return QUESTIONS_PUBLIC[CURRENT_INDEX] if 0 <= CURRENT_INDEX < TOTAL_QUESTIONS else None
+
+def current_answer_index():
+    return Q_ANSWERS[CURRENT_INDEX] if 0 <= CURRENT_INDEX < TOTAL_QUESTIONS else -1
 
 def winners_from_scores():
-    if not SCORES:
+    """(winner names, max score) read off the head of SCORE_ORDER; no scan of SCORES."""
+    if not SCORE_ORDER:
         return [], 0
-    mx = max(SCORES.values())
-    return [n for (n, s) in SCORES.items() if s == mx], mx
+    top = SCORE_ORDER[0][0]
+    # (top + 1,) sorts after every (top, name) and before every lower score
+    end = bisect_left(SCORE_ORDER, (top + 1,))
+    return [n for _, n in SCORE_ORDER[:end]], -top
+
+def drop_score(name):
+    global SCORES_VERSION
+    old = SCORES.pop(name, None)
+    if old is not None:
+        SCORES_VERSION += 1
+        i = bisect_left(SCORE_ORDER, (-old, name))
+        if i < len(SCORE_ORDER) and SCORE_ORDER[i] == (-old, name):
+            del SCORE_ORDER[i]
+
+def set_score(name, score):
+    """Update SCORES[name] and move it to its new place in SCORE_ORDER."""
+    global SCORES_VERSION
+    SCORES_VERSION += 1
+    drop_score(name)
+    SCORES[name] = score
+    insort(SCORE_ORDER, (-score, name))
+
+def add_player_id(name):
+    PLAYER_ID[name] = len(PLAYER_NAMES)
+    PLAYER_NAMES.append(name)
+    SUBMITTED.append(0)
+
+def rename_player_id(old, new):
+    pid = PLAYER_ID.pop(old)
+    PLAYER_ID[new] = pid
+    PLAYER_NAMES[pid] = new
+    return pid
+
+def clear_submissions():
+    global SUBMITTED, SUBMITTED_COUNT
+    SUBMITTED = bytearray(len(PLAYER_NAMES))
+    SUBMITTED_COUNT = 0
+
+def mark_submitted(pid):
+    """Returns True if this is the player's first submission for the current question."""
+    global SUBMITTED_COUNT
+    if SUBMITTED[pid]:
+        return False
+    SUBMITTED[pid] = 1
+    SUBMITTED_COUNT += 1
+    return True
+
+def unmark_submitted(pid):
+    global SUBMITTED_COUNT
+    if SUBMITTED[pid]:
+        SUBMITTED[pid] = 0
+        SUBMITTED_COUNT -= 1
+
+def reset_scores(names=()):
+    global SCORES, SCORE_ORDER, SCORES_VERSION
+    SCORES_VERSION += 1
+    SCORES = dict.fromkeys(names, 0)
+    SCORE_ORDER = sorted((0, name) for name in names)
+
+# C0 controls and DEL, except the whitespace ones (tab, newline...) that split() collapses
+_CONTROL_CHARS = dict.fromkeys(c for c in [*range(0x20), 0x7f] if not chr(c).isspace())
+
+def _drop_orphan_marks(name):
+    """Remove combining marks with no base letter (at the start or after whitespace);
+       NFKC turns a spacing "¨" into space + U+0308, which would otherwise survive strip()."""
+    out = []
+    for c in name:
+        if unicodedata.combining(c) and (not out or out[-1].isspace()):
+            continue
+        out.append(c)
+    return "".join(out)
 
-_ws_collapse = re.compile(r"\s+")
 def normalize_name(name: str) -> str:
-    name = (name or "").strip()
-    name = _ws_collapse.sub(" ", name)
+    name = name or ""
+    # Printable ASCII is already NFKC and control-free; anything else is cleaned first,
+    # so the strip/collapse below sees the final characters
+    if not (name.isascii() and name.isprintable()):
+        name = _drop_orphan_marks(unicodedata.normalize("NFKC", name).translate(_CONTROL_CHARS))
+    name = name.strip()
+    # Printable with no double space means the only whitespace is single ASCII spaces;
+    # otherwise collapse runs with split/join (C-level, cheaper than a regex for short names)
+    if "  " in name or not name.isprintable():
+        name = " ".join(name.split())
     if not name or len(name) > 40:
         return ""
     return name
 
+def name_key(name: str) -> str:
+    """NAME_INDEX key: case- and accent-insensitive, so "José" and "jose" collide."""
+    if name.isascii():
+        return name.casefold()
+    name = unicodedata.normalize("NFKD", name)
+    return "".join(c for c in name if not unicodedata.combining(c)).casefold()
+
 def ensure_unique_on_register(requested_name: str):
     nm = normalize_name(requested_name)
     if not nm:
         return False, "Name required"
-    lower = nm.casefold()
-    if lower in NAME_INDEX:
+    if name_key(nm) in NAME_INDEX:
         return False, "That name is already taken. Please pick a different name."
     return True, nm
 
 def bump_session():
     global QUIZ_SESSION
     QUIZ_SESSION = str(int(time.time()*1000))
+    mark_state_dirty()
+
+def mark_state_dirty():
+    """Call after any change to the fields served by /api/state."""
+    global STATE_VERSION
+    with STATE_COND:
+        STATE_VERSION += 1
+        STATE_COND.notify_all()
+
+def state_payload():
+    return {
+        "session": QUIZ_SESSION,
+        "phase": PHASE,
+        "current_index": CURRENT_INDEX,
+        "total_questions": TOTAL_QUESTIONS,
+        "players_count": len(NAME_INDEX),
+        "submissions_count": SUBMITTED_COUNT,
+        "poll_ms": POLL_MS[PHASE],
+        # Only the question/answer screens show the question card
+        "question": current_question_public() if PHASE in ("question", "answer") else None,
+        # Bundled while it is on screen, so clients don't all fetch /api/leaderboard at once
+        "leaderboard": leaderboard_payload() if PHASE in ("reveal", "final") else None
+    }
+
+def leaderboard_payload():
+    return {"rows": LB_ROWS_SNAPSHOT, "winners": LB_WINNERS_SNAPSHOT, "max_score": LB_MAX_SNAPSHOT}
 
 def score_current_question_once():
     """Award +1 to players whose *last* submitted answer matches the correct answer.
@@ -81,39 +272,109 @@ def score_current_question_once():
     global LAST_SCORED_INDEX
     if CURRENT_INDEX == -1 or CURRENT_INDEX == LAST_SCORED_INDEX:
         return
-    q = current_question()
-    if not q:
-        LAST_SCORED_INDEX = CURRENT_INDEX
-        return
-    correct_idx = q.get("answer", None)
-    if correct_idx is None:
+    correct_idx = current_answer_index()
+    if correct_idx < 0:
         LAST_SCORED_INDEX = CURRENT_INDEX
         return
-    for name in PLAYERS:
-        ans = CURRENT_ANSWERS.get(name, None)
+    # Only submitters can score; CURRENT_ANSWERS keys are canonical names of current players
+    for name, ans in CURRENT_ANSWERS.items():
         if ans == correct_idx:
-            SCORES[name] += 1
+            set_score(name, SCORES.get(name, 0) + 1)
     LAST_SCORED_INDEX = CURRENT_INDEX
 
 def snapshot_leaderboard():
     """Create a snapshot of the leaderboard (used only in reveal/final)."""
-    global LB_ROWS_SNAPSHOT, LB_WINNERS_SNAPSHOT, LB_MAX_SNAPSHOT
-    rows = sorted(SCORES.items(), key=lambda kv: kv[1], reverse=True)
-    LB_ROWS_SNAPSHOT = [{"name": k, "score": v} for k, v in rows]
+    global LB_ROWS_SNAPSHOT, LB_WINNERS_SNAPSHOT, LB_MAX_SNAPSHOT, LB_ENCODED_SNAPSHOT
+    global LB_SNAPSHOT_VERSION
+    if LB_SNAPSHOT_VERSION == SCORES_VERSION:
+        return  # no score changed since the last snapshot (e.g. reveal -> final)
+    LB_SNAPSHOT_VERSION = SCORES_VERSION
+    LB_ROWS_SNAPSHOT = [{"name": n, "score": -s} for s, n in SCORE_ORDER]
     LB_WINNERS_SNAPSHOT, LB_MAX_SNAPSHOT = winners_from_scores()
+    body = orjson.dumps(leaderboard_payload())
+    LB_ENCODED_SNAPSHOT = (body, gzip.compress(body, 6) if len(body) >= GZIP_MIN_SIZE else None)
 
 def clear_leaderboard_snapshot():
-    global LB_ROWS_SNAPSHOT, LB_WINNERS_SNAPSHOT, LB_MAX_SNAPSHOT
+    global LB_ROWS_SNAPSHOT, LB_WINNERS_SNAPSHOT, LB_MAX_SNAPSHOT, LB_ENCODED_SNAPSHOT
+    global LB_SNAPSHOT_VERSION
+    LB_SNAPSHOT_VERSION = -1
     LB_ROWS_SNAPSHOT = []
     LB_WINNERS_SNAPSHOT = []
     LB_MAX_SNAPSHOT = 0
+    LB_ENCODED_SNAPSHOT = (orjson.dumps({"rows": [], "winners": [], "max_score": 0}), None)
+
+def _with_state_lock(fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with STATE_LOCK:
+            return fn(*args, **kwargs)
+    return wrapper
+
+def _json(obj, status=200):
+    return Response(orjson.dumps(obj), status=status, mimetype="application/json")
+
+SMALL_BODY_MAX = 1024  # register/submit bodies are a name and an answer index
+
+def _small_json_body():
+    """JSON object from a register/submit body: 413 past SMALL_BODY_MAX bytes, 400 if not an object."""
+    if (request.content_length or 0) > SMALL_BODY_MAX:
+        abort(413)
+    data = request.stream.read(SMALL_BODY_MAX + 1)  # also bounds chunked bodies with no Content-Length
+    if len(data) > SMALL_BODY_MAX:
+        abort(413)
+    try:
+        payload = orjson.loads(data)
+    except orjson.JSONDecodeError:
+        abort(400)
+    if type(payload) is not dict:
+        abort(400)
+    return payload
+
+def _str_field(payload, key):
+    """payload[key] if it is a string, else "" (missing, null, numbers, lists...)."""
+    value = payload.get(key)
+    return value if type(value) is str else ""
+
+def _cached_bytes(buf, mimetype="application/json", gz=None):
+    """Response for a prebuilt bytes body, handed to the WSGI server as-is.
+       `gz` is an optional pre-gzipped copy, sent instead when the client accepts gzip."""
+    use_gz = gz is not None and request.accept_encodings["gzip"]
+    body = gz if use_gz else buf
+    resp = Response(body, mimetype=mimetype, direct_passthrough=True)
+    resp.headers["Content-Length"] = str(len(body))
+    if gz is not None:
+        resp.vary.add("Accept-Encoding")
+    if use_gz:
+        resp.headers["Content-Encoding"] = "gzip"
+    return resp
+
+def _throttled(name):
+    """True if `name` is submitting too fast (min gap or burst window); otherwise records now."""
+    now = time.monotonic_ns()
+    recent = LAST_SUBMISSION_TS.get(name)
+    if recent is None:
+        recent = LAST_SUBMISSION_TS[name] = deque(maxlen=SUBMIT_BURST)
+    elif now - recent[-1] < SUBMIT_THROTTLE_NS:
+        return True
+    elif len(recent) == SUBMIT_BURST and now - recent[0] < SUBMIT_WINDOW_NS:
+        return True  # oldest of the last SUBMIT_BURST is still inside the window
+    recent.append(now)
+    LAST_SUBMISSION_TS.move_to_end(name)
+    if len(LAST_SUBMISSION_TS) > THROTTLE_MAX:
+        LAST_SUBMISSION_TS.popitem(last=False)
+    return False
 
 def admin_logged_in():
     return session.get('is_admin') is True
 
-def _require_admin():
-    if not admin_logged_in():
-        abort(403)
+def _admin_only(fn):
+    """403 unless logged in as admin; checked before taking STATE_LOCK."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not admin_logged_in():
+            abort(403)
+        return fn(*args, **kwargs)
+    return wrapper
 
 # ----------------------- HTML (user) -----------------------
 
@@ -172,205 +433,14 @@ INDEX_HTML = """
 
   <div class="card">
     <button class="secondary" onclick="refresh()">Refresh</button>
-    <span class="muted">Auto-refreshes every 2s.</span>
+    <span class="muted">Updates live as the quiz advances.</span>
   </div>
 
   <p class="muted">Facilitator controls at <code>/admin</code>.</p>
 </div>
 
-<script>
-let state = null;
-let myName = localStorage.getItem('quiz_name') || '';
-let lastRenderKey = ""; // session:phase:index
-let currentSession = null;
-let lastSession = localStorage.getItem('quiz_session') || null;
-
-function el(id){ return document.getElementById(id); }
-function val(id){ return el(id).value.trim(); }
-
-function setNameEditable(editable){
-  el('player').disabled = !editable;
-  el('regBtn').disabled = !editable;
-  el('nameLocked').style.display = editable ? 'none' : 'inline';
-}
-
-async function register(){
-  const name = val('player');
-  el('regError').textContent = '';
-  const prev = localStorage.getItem('quiz_name') || null; // send previous for rename support
-  const r = await fetch('/api/register',{
-    method:'POST',
-    headers:{'Content-Type':'application/json'},
-    body:JSON.stringify({name, prev})
-  });
-  const data = await r.json().catch(()=>({}));
-  if(r.ok && data.ok){
-    localStorage.setItem('quiz_name', name);
-    myName = name;
-    const badge = el('regStatus');
-    badge.style.display='inline-block';
-    badge.className='badge ok';
-    badge.textContent='Registered';
-  }else{
-    el('regError').textContent = (data && data.message) ? data.message : 'Registration failed';
-  }
-}
-
-function lsKeyFor(session, idx){ return 'ans_'+session+'_'+idx; }
-
-async function loadState(){
-  const r = await fetch('/api/state');
-  state = await r.json();
-  // Session switch handling
-  currentSession = state.session;
-  if(currentSession && currentSession !== lastSession){
-    localStorage.setItem('quiz_session', currentSession);
-    lastSession = currentSession;
-    lastRenderKey = ""; // force re-render
-  }
-  renderState();
-}
-
-function renderQuestion(readonly){
-  const qc = el('questionCard');
-  const Q = state.question;
-  if(!Q){ qc.style.display='none'; return; }
-  qc.style.display='block';
-
-  const savedAns = currentSession ? localStorage.getItem(lsKeyFor(currentSession, state.current_index)) : null;
-  const savedIdx = savedAns !== null ? parseInt(savedAns) : null;
-
-  const opts = Q.options.map((o,i)=>{
-    const userCls = (savedIdx !== null && savedIdx === i) ? 'user-choice' : '';
-    const disabled = readonly ? 'disabled' : '';
-    return `<label class="${userCls}" style="display:block;margin:4px 0;">
-              <input type="radio" name="opt" value="${i}" ${disabled}> ${o}
-            </label>`;
-  }).join('');
-
-  qc.innerHTML = `
-    <div class="qtitle">${state.current_index+1}. ${Q.text}</div>
-    ${opts}
-    <div style="margin-top:8px;">
-      ${readonly ? '' : '<button class="primary" onclick="submitAnswer()">Submit</button>'}
-      <span id="submitStatus" class="badge warn" style="display:none"></span>
-    </div>
-    ${Q.note ? `<div class="muted" style="margin-top:8px;">💡 ${Q.note}</div>` : ''}
-  `;
-
-  // Ensure no default selection; restore only user's own choice in question phase
-  Array.from(qc.querySelectorAll('input[name="opt"]')).forEach(r => { r.checked = false; });
-  if(!readonly && savedIdx !== null){
-    const toCheck = qc.querySelector('input[name="opt"][value="'+savedIdx+'"]');
-    if(toCheck) toCheck.checked = true;
-  }
-}
-
-function renderState(){
-  const pc = el('phaseCard');
-  const qc = el('questionCard');
-  const lb = el('leaderboard');
-
-  if(!val('player') && myName){ el('player').value = myName; }
-
-  pc.innerHTML = `<strong>Phase:</strong> ${state.phase.toUpperCase()} ·
-    Question ${state.current_index >= 0 ? state.current_index+1 : 0} / ${state.total_questions} ·
-    Players: ${state.players_count} · Submissions: ${state.submissions_count}`;
-
-  // NEW: toggle name editability only in lobby
-  setNameEditable(state.phase === 'lobby');
-
-  const currentKey = `${state.session}:${state.phase}:${state.current_index}`;
-
-  if(state.phase === 'lobby'){
-    qc.style.display='none';
-    lb.style.display='none';
-    lastRenderKey = currentKey;
-    return;
-  }
-
-  if(state.phase === 'question'){
-    if(currentKey !== lastRenderKey){
-      renderQuestion(false);
-      lb.style.display='none';
-      lastRenderKey = currentKey;
-    }
-    return;
-  }
-
-  if(state.phase === 'answer'){
-    if(currentKey !== lastRenderKey){
-      renderQuestion(true);
-      lb.style.display='none';
-      lastRenderKey = currentKey;
-    }
-    return;
-  }
-
-  if(state.phase === 'reveal'){
-    if(currentKey !== lastRenderKey){
-      qc.style.display='none';
-      loadLeaderboard(false);
-      lastRenderKey = currentKey;
-    }
-    return;
-  }
-
-  if(state.phase === 'final'){
-    if(currentKey !== lastRenderKey){
-      qc.style.display='none';
-      loadLeaderboard(true);
-      lastRenderKey = currentKey;
-    }
-    return;
-  }
-}
-
-async function submitAnswer(){
-  const name = val('player') || myName;
-  if(!name){ alert('Please register your name first.'); return; }
-  const chosen = document.querySelector('input[name="opt"]:checked');
-  const answer = chosen ? parseInt(chosen.value) : null;
-  const r = await fetch('/api/submit', {
-    method:'POST',
-    headers:{'Content-Type':'application/json'},
-    body: JSON.stringify({ name, answer })
-  });
-  const data = await r.json();
-  const s = el('submitStatus');
-  if(r.ok && data.accepted){
-    if(chosen && currentSession){
-      localStorage.setItem(lsKeyFor(currentSession, state.current_index), String(answer));
-    }
-    s.style.display='inline-block';
-    s.className='badge warn';
-    s.textContent = 'Saved';
-    renderQuestion(false);
-  } else {
-    s.style.display='inline-block';
-    s.className='badge warn';
-    s.textContent = data.message || 'Not accepted';
-  }
-}
-
-async function loadLeaderboard(final){
-  const r = await fetch('/api/leaderboard');
-  const data = await r.json();
-  const lb = el('leaderboard');
-  lb.style.display='block';
-  const winners = data.winners || [];
-  const max = data.max_score ?? 0;
-  lb.innerHTML = `<h3>${final ? 'Final ' : ''}Leaderboard</h3>` +
-    (data.rows || []).map((row, i) => {
-      const cls = winners.includes(row.name) && final ? 'winner' : '';
-      return `<div class="${cls}">${i+1}. <strong>${row.name}</strong> — ${row.score}${final && winners.includes(row.name) ? ' 🏆' : ''}</div>`;
-    }).join('') || '<em>No scores yet.</em>';
-}
-
-function refresh(){ loadState(); }
-setInterval(loadState, 2000);
-loadState();
-</script>
+<script src="{{ live_js }}" defer></script>
+<script src="{{ quiz_js }}" defer></script>
 </body>
 </html>
 """
@@ -405,6 +475,7 @@ ADMIN_HTML = """
     <button class="primary" onclick="post('/api/admin/start')">Start</button>
     <button class="secondary" onclick="post('/api/admin/advance')">Advance</button>
     <button onclick="post('/api/admin/reset')">Reset</button>
+    <button class="secondary" onclick="post('/api/admin/reload')">Reload questions</button>
     <a class="small" href="/admin/logout">Logout</a>
     <div id="status" class="status muted">Ready.</div>
   </div>
@@ -416,73 +487,8 @@ ADMIN_HTML = """
     <div id="adminLeaderboard" class="muted">Waiting…</div>
   </div>
 
-<script>
-let adminPhase = 'lobby';
-let adminSession = null;
-
-async function post(url){
-  const statusEl = document.getElementById('status');
-  try{
-    const r = await fetch(url, {method:'POST'});
-    const data = await r.json();
-    await loadEverything();
-    statusEl.textContent = (data && data.message) ? data.message : (r.ok ? 'OK' : 'Error');
-  }catch(e){
-    statusEl.textContent = 'Request failed.';
-  }
-}
-
-async function loadEverything(){
-  await Promise.all([loadState(), loadAdminState(), maybeLoadLeaderboard()]);
-}
-
-async function loadState(){
-  const r = await fetch('/api/state');
-  const s = await r.json();
-  adminPhase = s.phase;
-  adminSession = s.session;
-  document.getElementById('state').innerHTML =
-    `<div><strong>Session:</strong> ${adminSession} · <strong>Phase:</strong> ${s.phase.toUpperCase()} · Q ${s.current_index>=0?s.current_index+1:0}/${s.total_questions}</div>
-     <div><strong>Players:</strong> ${s.players_count} · <strong>Submissions:</strong> ${s.submissions_count}</div>`;
-  if(!(adminPhase === 'reveal' || adminPhase === 'final')){
-    document.getElementById('adminLeaderboard').innerHTML = '<em>Waiting for reveal…</em>';
-  }
-}
-
-async function loadAdminState(){
-  const r = await fetch('/api/admin_state');
-  if(!r.ok){ document.getElementById('adminQuestion').innerHTML = '<em>Not authorized or unavailable.</em>'; return; }
-  const a = await r.json();
-  const q = a.question;
-  if(!q){ document.getElementById('adminQuestion').innerHTML = '<em>No question loaded.</em>'; return; }
-
-  let opts = q.options.map((o,i)=>{
-    const cls = (a.phase === 'answer' && a.correct_answer_index === i) ? 'correct' : '';
-    return `<div class="${cls}" style="margin:4px 0;">${i+1}. ${o}</div>`;
-  }).join('');
-
-  document.getElementById('adminQuestion').innerHTML =
-    `<div><strong>Question ${a.current_index+1}:</strong> ${q.text}</div>
-     ${q.note ? `<div class="muted" style="margin-top:4px;">💡 ${q.note}</div>` : ''}
-     <div style="margin-top:8px;">${opts}</div>`;
-}
-
-async function maybeLoadLeaderboard(){
-  if(!(adminPhase === 'reveal' || adminPhase === 'final')) return;
-  const r = await fetch('/api/leaderboard');
-  const data = await r.json();
-  const winners = data.winners || [];
-  const max = data.max_score ?? 0;
-  document.getElementById('adminLeaderboard').innerHTML =
-    (data.rows && data.rows.length ? data.rows : []).map((row, i) => {
-      const crown = (adminPhase === 'final' && winners.includes(row.name)) ? ' 🏆' : '';
-      return `<div>${i+1}. <strong>${row.name}</strong> — ${row.score}${crown}</div>`;
-    }).join('') || '<em>No scores yet.</em>';
-}
-
-setInterval(loadEverything, 2000);
-loadEverything();
-</script>
+<script src="{{ live_js }}" defer></script>
+<script src="{{ admin_js }}" defer></script>
 </body>
 </html>
 """
@@ -518,27 +524,61 @@ LOGIN_HTML = """
 </html>
 """
 
+def _asset_url(filename):
+    """/static URL busted by content hash, so a changed file gets a new URL."""
+    with open(os.path.join(app.static_folder, filename), "rb") as f:
+        digest = hashlib.md5(f.read(), usedforsecurity=False).hexdigest()[:12]
+    return f"/static/{filename}?v={digest}"
+
+def _prebuilt_page(html, **assets):
+    """Render once; keep identity and gzip bodies, each with its own ETag."""
+    body = app.jinja_env.from_string(html).render(**assets).encode("utf-8")
+    etag = hashlib.md5(body, usedforsecurity=False).hexdigest()
+    return {"identity": (body, etag), "gzip": (gzip.compress(body, 9), etag + "-gz")}
+
+# INDEX_HTML / ADMIN_HTML only depend on the asset URLs, so they are built at import
+INDEX_PAGE = _prebuilt_page(INDEX_HTML, live_js=_asset_url("live.js"), quiz_js=_asset_url("quiz.js"))
+ADMIN_PAGE = _prebuilt_page(ADMIN_HTML, live_js=_asset_url("live.js"), admin_js=_asset_url("admin.js"))
+# LOGIN_HTML only varies by {{ error }}: compile once, pre-render the common no-error case
+LOGIN_TEMPLATE = app.jinja_env.from_string(LOGIN_HTML)
+LOGIN_PAGE = _prebuilt_page(LOGIN_HTML, error=None)
+
+def _static_page(page, cache_control):
+    encoding = "gzip" if request.accept_encodings["gzip"] else "identity"
+    body, etag = page[encoding]
+    if request.if_none_match.contains(etag):
+        resp = Response(status=304)
+    else:
+        resp = _cached_bytes(body, "text/html")
+        if encoding == "gzip":
+            resp.headers["Content-Encoding"] = "gzip"
+    resp.set_etag(etag)
+    resp.headers["Cache-Control"] = cache_control
+    resp.vary.add("Accept-Encoding")
+    return resp
+
 # ----------------------- ROUTES -----------------------
 
 @app.route("/")
 def index():
-    return render_template_string(INDEX_HTML)
+    return _static_page(INDEX_PAGE, "public, max-age=60")
 
 @app.route("/admin")
 def admin():
     if not admin_logged_in():
         return redirect(url_for("admin_login"))
-    return render_template_string(ADMIN_HTML)
+    # private + revalidate so a logged-out browser can't reuse the page from cache
+    return _static_page(ADMIN_PAGE, "private, no-cache")
 
 @app.route("/admin/login", methods=["GET", "POST"])
 def admin_login():
     if request.method == "POST":
         pw = (request.form.get("password") or "").strip()
-        if ADMIN_PASSWORD and pw == ADMIN_PASSWORD:
+        if ADMIN_PASSWORD and hmac.compare_digest(pw.encode(), ADMIN_PASSWORD_B):
             session['is_admin'] = True
             return redirect(url_for("admin"))
-        return render_template_string(LOGIN_HTML, error="Invalid password")
-    return render_template_string(LOGIN_HTML, error=None)
+        return LOGIN_TEMPLATE.render(error="Invalid password")
+    return _static_page(LOGIN_PAGE, "public, max-age=300")
 
 @app.route("/admin/logout")
 def admin_logout():
@@ -552,101 +592,138 @@ def api_register():
     - While in LOBBY: allow rename from 'prev' -> 'name' if unique.
     - After start: block renames; allow registering same name (no-op) but UI prevents changes anyway.
     """
-    global PLAYERS, NAME_INDEX, SCORES, SUBMITTED, CURRENT_ANSWERS, LAST_SUBMISSION_TS
-    payload = request.get_json(force=True)
-    requested = (payload.get("name") or "")
-    prev = (payload.get("prev") or "").strip() or None
+    payload = _small_json_body()
+    requested = _str_field(payload, "name")
+    prev = _str_field(payload, "prev").strip() or None
 
     # Normalize targets
     new_norm = normalize_name(requested)
     if not new_norm:
-        return jsonify({"ok": False, "message": "Name required"}), 400
-    new_lower = new_norm.casefold()
+        return _json({"ok": False, "message": "Name required"}, 400)
+    new_lower = name_key(new_norm)
+    prev_lower = name_key(normalize_name(prev)) if prev else ""
+
+    with STATE_LOCK:
+        # If prev provided & exists -> possible rename flow
+        if prev:
+            prev_exists = prev_lower in NAME_INDEX
+
+            # If it's actually the same name (case-insensitive), just ack
+            if prev_exists and prev_lower == new_lower:
+                return _json({"ok": True, "name": NAME_INDEX[prev_lower]})
+
+            # Renaming allowed only before quiz starts
+            if PHASE != "lobby":
+                return _json({"ok": False, "message": "Quiz already started — name changes are locked."}, 400)
+
+            # Ensure the new name is free (cannot collide with someone else)
+            if new_lower in NAME_INDEX:
+                return _json({"ok": False, "message": "That name is already taken. Please pick a different name."}, 400)
 
-    # If prev provided & exists -> possible rename flow
-    if prev:
-        prev_norm = normalize_name(prev)
-        prev_lower = prev_norm.casefold() if prev_norm else ""
-        prev_exists = prev_lower in NAME_INDEX
+            # If prev exists, migrate state to new canonical name
+            if prev_exists:
+                old_canon = NAME_INDEX.pop(prev_lower)
+                old_score = SCORES.get(old_canon, 0)
+                drop_score(old_canon)
 
-        # If it's actually the same name (case-insensitive), just ack
-        if prev_exists and prev_lower == new_lower:
-            return jsonify({"ok": True})
+                NAME_INDEX[new_lower] = new_norm
+                set_score(new_norm, old_score)
 
-        # Renaming allowed only before quiz starts
-        if PHASE != "lobby":
-            return jsonify({"ok": False, "message": "Quiz already started — name changes are locked."}), 400
+                unmark_submitted(rename_player_id(old_canon, new_norm))
+                CURRENT_ANSWERS.pop(old_canon, None)
+                LAST_SUBMISSION_TS.pop(old_canon, None)
+                mark_state_dirty()
 
-        # Ensure the new name is free (cannot collide with someone else)
+                return _json({"ok": True, "name": new_norm})
+            # If prev not found, fall through to "new registration" logic below.
+
+        # New registration (or updating same name with no prev)
         if new_lower in NAME_INDEX:
-            return jsonify({"ok": False, "message": "That name is already taken. Please pick a different name."}), 400
-
-        # If prev exists, migrate state to new canonical name
-        if prev_exists:
-            old_canon = NAME_INDEX.pop(prev_lower)
-            if old_canon in PLAYERS:
-                PLAYERS.remove(old_canon)
-            old_score = SCORES.pop(old_canon, 0)
-
-            PLAYERS.add(new_norm)
-            NAME_INDEX[new_lower] = new_norm
-            SCORES[new_norm] = old_score
-
-            SUBMITTED.discard(old_canon)
-            CURRENT_ANSWERS.pop(old_canon, None)
-            LAST_SUBMISSION_TS.pop(old_canon, None)
-
-            return jsonify({"ok": True})
-        # If prev not found, fall through to "new registration" logic below.
-
-    # New registration (or updating same name with no prev)
-    if new_lower in NAME_INDEX:
-        return jsonify({"ok": True})  # no-op if same name already present
-    PLAYERS.add(new_norm)
-    NAME_INDEX[new_lower] = new_norm
-    SCORES[new_norm] = SCORES[new_norm]
-    return jsonify({"ok": True})
+            return _json({"ok": True, "name": NAME_INDEX[new_lower]})  # no-op if same name already present
+        NAME_INDEX[new_lower] = new_norm
+        add_player_id(new_norm)
+        set_score(new_norm, 0)
+        mark_state_dirty()
+        return _json({"ok": True, "name": new_norm})
+
+def _state_entry():
+    """_STATE_CACHE for the current STATE_VERSION, re-encoded only when it has moved."""
+    global _STATE_CACHE, _STATE_BASE
+    entry = _STATE_CACHE
+    if entry[0] != STATE_VERSION:
+        with STATE_LOCK:
+            # Threads woken by the same notify_all queue here: only the first re-encodes
+            entry = _STATE_CACHE
+            if entry[0] == STATE_VERSION:
+                return entry
+            payload = state_payload()
+            counts = {k: payload[k] for k in COUNT_FIELDS}
+            base = {k: v for k, v in payload.items() if k not in counts}
+            if base != _STATE_BASE[0]:
+                _STATE_BASE = (base, _STATE_BASE[1] + 1)
+            body = orjson.dumps(payload)
+            etag = hashlib.md5(body, usedforsecurity=False).hexdigest()
+            entry = _STATE_CACHE = (STATE_VERSION, body, etag, _STATE_BASE[1], orjson.dumps(counts))
+    return entry
+
+def state_snapshot():
+    """(body, etag) for state_payload()."""
+    return _state_entry()[1:3]
 
 @app.route("/api/state")
 def api_state():
     # Public state for participants (NO CORRECT ANSWER)
-    qs = load_questions()
-    q = current_question()
-    q_pub = None
-    if q:
-        q_pub = {"text": q.get("text"), "options": q.get("options", []), "note": q.get("note")}
-    return jsonify({
-        "session": QUIZ_SESSION,
-        "phase": PHASE,
-        "current_index": CURRENT_INDEX,
-        "total_questions": len(qs),
-        "players_count": len(PLAYERS),
-        "submissions_count": len(SUBMITTED),
-        "question": q_pub
-    })
+    body, etag = state_snapshot()
+    # no-cache: browsers revalidate every poll, and an unchanged state costs a bare 304
+    if request.if_none_match.contains(etag):
+        resp = Response(status=304)
+    else:
+        resp = _cached_bytes(body)
+    resp.set_etag(etag)
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp
+
+@app.route("/api/events")
+def api_events():
+    """Server-Sent Events: pushes the /api/state payload whenever it changes.
+       When only COUNT_FIELDS moved since the last frame, sends a small 'counts' event instead."""
+    def stream():
+        last, last_base, sent_at = -1, -1, 0.0
+        while True:
+            with STATE_COND:
+                STATE_COND.wait_for(lambda: STATE_VERSION != last, timeout=25)
+                version = STATE_VERSION
+            if version == last:
+                yield b": keepalive\n\n"
+                continue
+            # A burst of submits would otherwise be one frame each; let it settle briefly
+            delay = sent_at + SSE_MIN_INTERVAL_S - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            sent_at = time.monotonic()
+            last, body, _, base_id, counts = _state_entry()
+            if base_id == last_base:
+                yield b"event: counts\ndata: " + counts + b"\n\n"
+            else:
+                last_base = base_id
+                yield b"data: " + body + b"\n\n"
+    return Response(stream(), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 @app.route("/api/admin_state")
+@_admin_only
+@_with_state_lock
 def api_admin_state():
-    _require_admin()
-    qs = load_questions()
-    q = current_question()
-    q_pub = None
-    correct_index = None
-    if q:
-        q_pub = {"text": q.get("text"), "options": q.get("options", []), "note": q.get("note")}
-        try:
-            correct_index = int(q.get("answer"))
-        except Exception:
-            correct_index = None
-    return jsonify({
+    correct_index = current_answer_index()
+    return _json({
         "session": QUIZ_SESSION,
         "phase": PHASE,
         "current_index": CURRENT_INDEX,
-        "total_questions": len(qs),
-        "players_count": len(PLAYERS),
-        "submissions_count": len(SUBMITTED),
-        "question": q_pub,
-        "correct_answer_index": correct_index
+        "total_questions": TOTAL_QUESTIONS,
+        "players_count": len(NAME_INDEX),
+        "submissions_count": SUBMITTED_COUNT,
+        "question": current_question_public(),
+        "correct_answer_index": correct_index if correct_index >= 0 else None
     })
 
 @app.route("/api/submit", methods=["POST"])
@@ -656,123 +733,173 @@ def api_submit():
     Users may resubmit; we keep the last answer.
     Scoring is deferred to transition to ANSWER.
     """
-    global SUBMITTED, CURRENT_ANSWERS
-    if PHASE != "question":
-        return jsonify({"accepted": False, "message": "Not accepting answers now"}), 400
-
-    payload = request.get_json(force=True)
-    name = (payload.get("name") or "").strip()
-    lower = normalize_name(name).casefold() if name else ""
-    if lower not in NAME_INDEX:
-        return jsonify({"accepted": False, "message": "Please register first"}), 400
-    canonical = NAME_INDEX[lower]
-
-    now = time.time()
-    if canonical in LAST_SUBMISSION_TS and (now - LAST_SUBMISSION_TS[canonical] < 0.3):
-        return jsonify({"accepted": False, "message": "Slow down"}), 429
-    LAST_SUBMISSION_TS[canonical] = now
-
+    # Parse and normalize outside the lock; the locked part is a few lookups/assignments
+    payload = _small_json_body()
     answer = payload.get("answer", None)
-    CURRENT_ANSWERS[canonical] = answer
+    name = _str_field(payload, "name")
+    # Clients send back the canonical name /api/register returned, so normalizing is
+    # only needed for older/hand-written clients; the locked lookup below is authoritative
+    key = name_key(name)
+    if key not in NAME_INDEX:
+        key = name_key(normalize_name(name))
+
+    with STATE_LOCK:
+        if PHASE != "question":
+            return _json({"accepted": False, "message": "Not accepting answers now"}, 400)
 
-    SUBMITTED.add(canonical)
+        # None means "submitted with nothing selected"; anything else must be a valid option index
+        if answer is not None:
+            q = current_question_public()
+            n_opts = len(q["options"]) if q else 0
+            if type(answer) is not int or not 0 <= answer < n_opts:
+                return _json({"accepted": False, "message": "Invalid answer"}, 400)
 
-    if len(PLAYERS) > 0 and len(SUBMITTED) >= len(PLAYERS):
-        _advance_to_answer()
+        canonical = NAME_INDEX.get(key)
+        if canonical is None:
+            return _json({"accepted": False, "message": "Please register first"}, 400)
 
-    return jsonify({"accepted": True})
+        # Same answer again (double-click, retry): nothing to record or push
+        if canonical in CURRENT_ANSWERS and CURRENT_ANSWERS[canonical] == answer:
+            return _json({"accepted": True})
+
+        if _throttled(canonical):
+            return _json({"accepted": False, "message": "Slow down"}, 429)
+
+        CURRENT_ANSWERS[canonical] = answer
+
+        # A changed answer isn't visible in /api/state; only a first submission moves the count
+        if mark_submitted(PLAYER_ID[canonical]):
+            mark_state_dirty()
+            if SUBMITTED_COUNT >= len(NAME_INDEX):
+                _advance_to_answer()
+
+    return _json({"accepted": True})
 
 @app.route("/api/leaderboard")
 def api_leaderboard():
     """Returns the leaderboard SNAPSHOT (only refreshed in reveal/final)."""
-    return jsonify({
-        "rows": LB_ROWS_SNAPSHOT,
-        "winners": LB_WINNERS_SNAPSHOT,
-        "max_score": LB_MAX_SNAPSHOT
-    })
+    body, gz = LB_ENCODED_SNAPSHOT
+    return _cached_bytes(body, gz=gz)
 
 # ----------------- Admin controls -----------------
 
 def _advance_to_question():
-    global PHASE, SUBMITTED, CURRENT_ANSWERS
+    global PHASE, CURRENT_ANSWERS
     PHASE = "question"
-    SUBMITTED = set()
+    clear_submissions()
     CURRENT_ANSWERS = {}
+    mark_state_dirty()
 
 def _advance_to_answer():
     global PHASE
     score_current_question_once()
     PHASE = "answer"
+    mark_state_dirty()
 
 def _advance_to_reveal():
     global PHASE
     PHASE = "reveal"
     snapshot_leaderboard()
+    mark_state_dirty()
 
 def _advance_to_final():
     global PHASE
     PHASE = "final"
     snapshot_leaderboard()
+    mark_state_dirty()
 
 @app.route("/api/admin/start", methods=["POST"])
+@_admin_only
+@_with_state_lock
 def api_admin_start():
-    _require_admin()
-    global PHASE, CURRENT_INDEX, SCORES, SUBMITTED, CURRENT_ANSWERS, LAST_SCORED_INDEX
+    global PHASE, CURRENT_INDEX, CURRENT_ANSWERS, LAST_SCORED_INDEX
     clear_leaderboard_snapshot()
     bump_session()  # new session on every start
-    qs = load_questions()
-    SCORES = defaultdict(int, {name: 0 for name in PLAYERS})
-    SUBMITTED = set()
+    reload_questions()  # one stat() unless questions.yaml changed
+    reset_scores(PLAYER_NAMES)
+    clear_submissions()
+    LAST_SUBMISSION_TS.clear()
     CURRENT_ANSWERS = {}
     LAST_SCORED_INDEX = -1
-    CURRENT_INDEX = 0 if len(qs) > 0 else -1
+    CURRENT_INDEX = 0 if TOTAL_QUESTIONS > 0 else -1
     PHASE = "question" if CURRENT_INDEX >= 0 else "final"
     if PHASE == "final":
         snapshot_leaderboard()
-    return jsonify({"ok": True, "message": "Quiz started"})
+    mark_state_dirty()
+    return _json({"ok": True, "message": "Quiz started"})
+
+def _advance_from_lobby():
+    return _json({"ok": False, "message": "Start the quiz first"}, 400)
+
+def _advance_from_question():
+    _advance_to_answer()
+    return _json({"ok": True, "message": "Showing correct answer"})
+
+def _advance_from_answer():
+    _advance_to_reveal()
+    return _json({"ok": True, "message": "Showing leaderboard"})
+
+def _advance_from_reveal():
+    global CURRENT_INDEX
+    if CURRENT_INDEX + 1 < TOTAL_QUESTIONS:
+        CURRENT_INDEX += 1
+        _advance_to_question()
+        return _json({"ok": True, "message": f"Next question ({CURRENT_INDEX+1}/{TOTAL_QUESTIONS})"})
+    _advance_to_final()
+    return _json({"ok": True, "message": "Quiz finished"})
+
+def _advance_from_final():
+    return _json({"ok": True, "message": "Already final"})
+
+# PHASE -> handler for the admin "Advance" button
+_ADVANCE = {
+    "lobby": _advance_from_lobby,
+    "question": _advance_from_question,
+    "answer": _advance_from_answer,
+    "reveal": _advance_from_reveal,
+    "final": _advance_from_final,
+}
 
 @app.route("/api/admin/advance", methods=["POST"])
+@_admin_only
+@_with_state_lock
 def api_admin_advance():
-    _require_admin()
-    global PHASE, CURRENT_INDEX
-    qs = load_questions()
-    if PHASE == "question":
-        _advance_to_answer()
-        return jsonify({"ok": True, "message": "Showing correct answer"})
-    elif PHASE == "answer":
-        _advance_to_reveal()
-        return jsonify({"ok": True, "message": "Showing leaderboard"})
-    elif PHASE == "reveal":
-        if CURRENT_INDEX + 1 < len(qs):
-            CURRENT_INDEX += 1
-            _advance_to_question()
-            return jsonify({"ok": True, "message": f"Next question ({CURRENT_INDEX+1}/{len(qs)})"})
-        else:
-            _advance_to_final()
-            return jsonify({"ok": True, "message": "Quiz finished"})
-    elif PHASE == "lobby":
-        return jsonify({"ok": False, "message": "Start the quiz first"}), 400
-    else:
-        return jsonify({"ok": True, "message": "Already final"})
+    return _ADVANCE[PHASE]()
 
 @app.route("/api/admin/reset", methods=["POST"])
+@_admin_only
+@_with_state_lock
 def api_admin_reset():
     """Hard reset: requires users to register again and starts a new session."""
-    _require_admin()
-    global PHASE, CURRENT_INDEX, PLAYERS, NAME_INDEX, SCORES, SUBMITTED, CURRENT_ANSWERS
+    global PHASE, CURRENT_INDEX, NAME_INDEX, PLAYER_ID, PLAYER_NAMES, CURRENT_ANSWERS
     global LAST_SUBMISSION_TS, LAST_SCORED_INDEX
     PHASE = "lobby"
     CURRENT_INDEX = -1
-    PLAYERS = set()
     NAME_INDEX = {}
-    SCORES = defaultdict(int)
-    SUBMITTED = set()
+    reset_scores()
+    PLAYER_ID = {}
+    PLAYER_NAMES = []
+    clear_submissions()
     CURRENT_ANSWERS = {}
-    LAST_SUBMISSION_TS = {}
+    LAST_SUBMISSION_TS = OrderedDict()
     LAST_SCORED_INDEX = -1
     clear_leaderboard_snapshot()
     bump_session()  # fresh session on reset
-    return jsonify({"ok": True, "message": "Hard reset complete — players must register again"})
+    reload_questions()
+    return _json({"ok": True, "message": "Hard reset complete — players must register again"})
+
+@app.route("/api/admin/reload", methods=["POST"])
+@_admin_only
+@_with_state_lock
+def api_admin_reload():
+    """Re-read questions.yaml without touching players or scores."""
+    # Mid-quiz, clients keep the card they rendered while submit/scoring would use the new file
+    if PHASE not in ("lobby", "final"):
+        return _json({"ok": False, "message": "Reload is only available in the lobby or after the quiz"}, 400)
+    reload_questions()
+    return _json({"ok": True, "message": f"Loaded {len(QUESTIONS)} questions"})
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=int(os.environ.get("PORT", "8080")))
+    # Local development only; see README "Deployment notes" for running under gunicorn
+    app.logger.warning("Flask development server: use `gunicorn -c gunicorn.conf.py app:app` in production")
+    app.run(host="0.0.0.0", port=int(os.environ.get("PORT", "8080")), threaded=True)
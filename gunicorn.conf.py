@@ -0,0 +1,14 @@
+# gunicorn -c gunicorn.conf.py app:app
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8080')}"
+
+# Quiz state is in-process memory: exactly one worker. Every visible tab keeps an
+# /api/events stream open for good, so concurrency comes from gevent greenlets rather
+# than a fixed thread pool that open streams would exhaust. Do not enable preload_app:
+# the worker must monkey-patch before importing app, so STATE_LOCK/STATE_COND are
+# created cooperative.
+workers = 1
+worker_class = "gevent"
+worker_connections = int(os.environ.get("GUNICORN_WORKER_CONNECTIONS", "2000"))
+keepalive = 75
@@ -0,0 +1,76 @@
+let adminPhase = 'lobby';
+let adminSession = null;
+let lastAdminKey = ''; // session:phase:index the question/leaderboard cards were loaded for
+let lastState = null;
+
+async function post(url){
+  const statusEl = document.getElementById('status');
+  try{
+    const r = await fetch(url, {method:'POST'});
+    const data = await r.json();
+    await loadEverything(true);
+    statusEl.textContent = (data && data.message) ? data.message : (r.ok ? 'OK' : 'Error');
+  }catch(e){
+    statusEl.textContent = 'Request failed.';
+  }
+}
+
+// force: re-fetch the question/leaderboard cards even if session:phase:index is unchanged
+async function loadEverything(force){
+  const r = await fetch('/api/state');
+  const s = await r.json();
+  await onState(s, force);
+  return s;
+}
+
+// Counters re-render on every state; the question and leaderboard cards are
+// only re-fetched when session/phase/index move (or when forced).
+async function onState(s, force){
+  lastState = s;
+  applyState(s);
+  const key = `${s.session}:${s.phase}:${s.current_index}`;
+  if(!force && key === lastAdminKey) return;
+  lastAdminKey = key;
+  showLeaderboard(s.leaderboard);
+  await loadAdminState();
+}
+
+function applyState(s){
+  adminPhase = s.phase;
+  adminSession = s.session;
+  document.getElementById('state').innerHTML =
+    `<div><strong>Session:</strong> ${adminSession} · <strong>Phase:</strong> ${s.phase.toUpperCase()} · Q ${s.current_index>=0?s.current_index+1:0}/${s.total_questions}</div>
+     <div><strong>Players:</strong> ${s.players_count} · <strong>Submissions:</strong> ${s.submissions_count}</div>`;
+  if(!(adminPhase === 'reveal' || adminPhase === 'final')){
+    document.getElementById('adminLeaderboard').innerHTML = '<em>Waiting for reveal…</em>';
+  }
+}
+
+async function loadAdminState(){
+  const r = await fetch('/api/admin_state');
+  if(!r.ok){ document.getElementById('adminQuestion').innerHTML = '<em>Not authorized or unavailable.</em>'; return; }
+  const a = await r.json();
+  const q = a.question;
+  if(!q){ document.getElementById('adminQuestion').innerHTML = '<em>No question loaded.</em>'; return; }
+
+  let opts = q.options.map((o,i)=>{
+    const cls = (a.phase === 'answer' && a.correct_answer_index === i) ? 'correct' : '';
+    return `<div class="${cls}" style="margin:4px 0;">${i+1}. ${o}</div>`;
+  }).join('');
+
+  document.getElementById('adminQuestion').innerHTML =
+    `<div><strong>Question ${a.current_index+1}:</strong> ${q.text}</div>
+     ${q.note ? `<div class="muted" style="margin-top:4px;">💡 ${q.note}</div>` : ''}
+     <div style="margin-top:8px;">${opts}</div>`;
+}
+
+// /api/state includes the leaderboard snapshot in reveal/final, null otherwise
+function showLeaderboard(data){
+  if(!data) return;
+  const winners = data.winners || [];
+  const rows = (data.rows || []).map((row, i) =>
+    leaderboardRow(row, i, adminPhase === 'final' && winners.includes(row.name)));
+  document.getElementById('adminLeaderboard').replaceChildren(...(rows.length ? rows : [noScoresNote()]));
+}
+
+startLiveUpdates(s => onState(s, false), c => onState({...lastState, ...c}, false), () => loadEverything(false));
@@ -0,0 +1,65 @@
+// Shared by quiz.js and admin.js (loaded first): live state updates and leaderboard rows.
+
+// Player names are user input: always set them via textContent, never innerHTML
+function leaderboardRow(row, i, isWinner){
+  const div = document.createElement('div');
+  if(isWinner) div.className = 'winner';
+  const name = document.createElement('strong');
+  name.textContent = row.name;
+  div.append(`${i+1}. `, name, ` — ${row.score}${isWinner ? ' 🏆' : ''}`);
+  return div;
+}
+
+function noScoresNote(){
+  const em = document.createElement('em');
+  em.textContent = 'No scores yet.';
+  return em;
+}
+
+// Server pushes state on every change; fall back to polling without EventSource.
+// Hidden tabs drop the stream (each one holds a server connection) and resync when shown.
+//   onFull(state)    full /api/state payload
+//   onCounts(counts) only players_count/submissions_count moved since the last full state
+//   pollOnce()       fetch and apply /api/state, resolving to it (its poll_ms paces the poller)
+function startLiveUpdates(onFull, onCounts, pollOnce){
+  let events = null, pollTimer = null, polling = false, pollMs = 2000;
+  let streamRefused = false; // stream closed for good (e.g. server refused it): poll instead
+
+  function start(){
+    if(window.EventSource && !streamRefused){
+      if(!events){
+        const es = events = new EventSource('/api/events');
+        // Dropped streams are retried by the browser; a refused one ends CLOSED
+        es.onerror = () => {
+          if(es.readyState !== EventSource.CLOSED || events !== es) return;
+          events = null;
+          streamRefused = true;
+          start();
+        };
+        es.onmessage = e => onFull(JSON.parse(e.data));
+        es.addEventListener('counts', e => onCounts(JSON.parse(e.data)));
+      }
+    }else if(!polling){
+      polling = true;
+      poll();
+    }
+  }
+  // Fallback poller: re-arms itself using the server's per-phase poll_ms hint
+  async function poll(){
+    pollTimer = null;
+    const s = await pollOnce().catch(() => null);
+    if(s && s.poll_ms) pollMs = s.poll_ms;
+    if(polling && !pollTimer) pollTimer = setTimeout(poll, pollMs);
+  }
+  function stop(){
+    if(events){ events.close(); events = null; }
+    streamRefused = false; // try the stream again next time the tab is shown
+    polling = false;
+    if(pollTimer){ clearTimeout(pollTimer); pollTimer = null; }
+  }
+
+  document.addEventListener('visibilitychange', () => document.hidden ? stop() : start());
+  window.addEventListener('pagehide', stop);
+  window.addEventListener('pageshow', () => { if(!document.hidden) start(); });
+  if(!document.hidden) start();
+}
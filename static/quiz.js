@@ -0,0 +1,177 @@
+let state = null;
+let myName = localStorage.getItem('quiz_name') || '';
+let lastRenderKey = ""; // session:phase:index
+let currentSession = null;
+let lastSession = localStorage.getItem('quiz_session') || null;
+let optLabels = []; // <label>s of the rendered question, in option order
+
+function el(id){ return document.getElementById(id); }
+function val(id){ return el(id).value.trim(); }
+
+function setNameEditable(editable){
+  el('player').disabled = !editable;
+  el('regBtn').disabled = !editable;
+  el('nameLocked').style.display = editable ? 'none' : 'inline';
+}
+
+async function register(){
+  const name = val('player');
+  el('regError').textContent = '';
+  const prev = localStorage.getItem('quiz_name') || null; // send previous for rename support
+  const r = await fetch('/api/register',{
+    method:'POST',
+    headers:{'Content-Type':'application/json'},
+    body:JSON.stringify({name, prev})
+  });
+  const data = await r.json().catch(()=>({}));
+  if(r.ok && data.ok){
+    myName = data.name || name; // canonical form, sent back as-is on submit
+    localStorage.setItem('quiz_name', myName);
+    const badge = el('regStatus');
+    badge.style.display='inline-block';
+    badge.className='badge ok';
+    badge.textContent='Registered';
+  }else{
+    el('regError').textContent = (data && data.message) ? data.message : 'Registration failed';
+  }
+}
+
+function lsKeyFor(session, idx){ return 'ans_'+session+'_'+idx; }
+
+async function loadState(){
+  const r = await fetch('/api/state');
+  const s = await r.json();
+  applyState(s);
+  return s;
+}
+
+function applyState(s){
+  state = s;
+  // Session switch handling
+  currentSession = state.session;
+  if(currentSession && currentSession !== lastSession){
+    localStorage.setItem('quiz_session', currentSession);
+    lastSession = currentSession;
+    lastRenderKey = ""; // force re-render
+  }
+  renderState();
+}
+
+function renderQuestion(readonly){
+  const qc = el('questionCard');
+  const Q = state.question;
+  if(!Q){ qc.style.display='none'; return; }
+  qc.style.display='block';
+
+  const savedAns = currentSession ? localStorage.getItem(lsKeyFor(currentSession, state.current_index)) : null;
+  const savedIdx = savedAns !== null ? parseInt(savedAns) : null;
+
+  const opts = Q.options.map((o,i)=>{
+    const userCls = (savedIdx !== null && savedIdx === i) ? 'user-choice' : '';
+    const disabled = readonly ? 'disabled' : '';
+    return `<label class="${userCls}" style="display:block;margin:4px 0;">
+              <input type="radio" name="opt" value="${i}" ${disabled}> ${o}
+            </label>`;
+  }).join('');
+
+  qc.innerHTML = `
+    <div class="qtitle">${state.current_index+1}. ${Q.text}</div>
+    ${opts}
+    <div style="margin-top:8px;">
+      ${readonly ? '' : '<button class="primary" onclick="submitAnswer()">Submit</button>'}
+      <span id="submitStatus" class="badge warn" style="display:none"></span>
+    </div>
+    ${Q.note ? `<div class="muted" style="margin-top:8px;">💡 ${Q.note}</div>` : ''}
+  `;
+
+  optLabels = Array.from(qc.querySelectorAll('label'));
+
+  // Ensure no default selection; restore only user's own choice in question phase
+  Array.from(qc.querySelectorAll('input[name="opt"]')).forEach(r => { r.checked = false; });
+  if(!readonly && savedIdx !== null){
+    const toCheck = qc.querySelector('input[name="opt"][value="'+savedIdx+'"]');
+    if(toCheck) toCheck.checked = true;
+  }
+}
+
+// Move the highlight after a submit without rebuilding the question card
+function applyUserChoice(idx){
+  optLabels.forEach((n, i) => n.classList.toggle('user-choice', i === idx));
+}
+
+function renderState(){
+  const pc = el('phaseCard');
+  const qc = el('questionCard');
+  const lb = el('leaderboard');
+
+  if(!val('player') && myName){ el('player').value = myName; }
+
+  pc.innerHTML = `<strong>Phase:</strong> ${state.phase.toUpperCase()} ·
+    Question ${state.current_index >= 0 ? state.current_index+1 : 0} / ${state.total_questions} ·
+    Players: ${state.players_count} · Submissions: ${state.submissions_count}`;
+
+  // NEW: toggle name editability only in lobby
+  setNameEditable(state.phase === 'lobby');
+
+  const currentKey = `${state.session}:${state.phase}:${state.current_index}`;
+  if(currentKey === lastRenderKey) return;
+  const render = PHASE_RENDERERS[state.phase];
+  if(render) render(qc, lb);
+  lastRenderKey = currentKey;
+}
+
+// Cards to show for each phase; only run when session/phase/index move
+const PHASE_RENDERERS = {
+  lobby(qc, lb){ qc.style.display='none'; lb.style.display='none'; },
+  question(qc, lb){ renderQuestion(false); lb.style.display='none'; },
+  answer(qc, lb){ renderQuestion(true); lb.style.display='none'; },
+  reveal(qc){ qc.style.display='none'; showLeaderboard(false); },
+  final(qc){ qc.style.display='none'; showLeaderboard(true); },
+};
+
+async function submitAnswer(){
+  const name = myName || val('player');
+  if(!name){ alert('Please register your name first.'); return; }
+  const chosen = document.querySelector('input[name="opt"]:checked');
+  const answer = chosen ? parseInt(chosen.value) : null;
+  // Debounce double-clicks: keep the button off for the request plus the server's 300ms gap
+  const btn = el('questionCard').querySelector('button.primary');
+  if(btn) btn.disabled = true;
+  const r = await fetch('/api/submit', {
+    method:'POST',
+    headers:{'Content-Type':'application/json'},
+    body: JSON.stringify({ name, answer })
+  }).finally(() => { if(btn) setTimeout(() => { btn.disabled = false; }, 300); });
+  const data = await r.json();
+  const s = el('submitStatus');
+  if(r.ok && data.accepted){
+    if(chosen && currentSession){
+      localStorage.setItem(lsKeyFor(currentSession, state.current_index), String(answer));
+    }
+    s.style.display='inline-block';
+    s.className='badge warn';
+    s.textContent = 'Saved';
+    if(chosen) applyUserChoice(answer);
+  } else {
+    s.style.display='inline-block';
+    s.className='badge warn';
+    s.textContent = data.message || 'Not accepted';
+  }
+}
+
+// The state carries the leaderboard in reveal/final; fetch it only from an older server
+async function showLeaderboard(final){
+  const data = state.leaderboard || await (await fetch('/api/leaderboard')).json();
+  const lb = el('leaderboard');
+  lb.style.display='block';
+  const winners = data.winners || [];
+  const title = document.createElement('h3');
+  title.textContent = `${final ? 'Final ' : ''}Leaderboard`;
+  const rows = (data.rows || []).map((row, i) =>
+    leaderboardRow(row, i, final && winners.includes(row.name)));
+  lb.replaceChildren(title, ...(rows.length ? rows : [noScoresNote()]));
+}
+
+function refresh(){ loadState(); }
+
+startLiveUpdates(applyState, c => applyState({...state, ...c}), loadState);